@@ -1,21 +1,68 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, send_file, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, send_from_directory, jsonify, g, make_response, session
 from flask_wtf import FlaskForm
 import httpx
 from wtforms import StringField, DateField, TextAreaField, SubmitField, PasswordField
 from wtforms.validators import DataRequired, Length, Regexp
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
 import json
 import os
+import sys
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, date, timedelta, timezone
 import re
+import hashlib
+import gzip
+import zlib
+import mimetypes
+import math
+import heapq
+import bisect
+import time
+import random
+import cProfile
+import pstats
+import threading
+import multiprocessing
+from collections import deque, OrderedDict
+from functools import lru_cache
+from markupsafe import Markup
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from report_parser import REQUIRED_REPORT_COLUMNS, parse_report_file
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from openai import OpenAI
 
+# brotli为可选依赖，未安装时只使用gzip压缩
+try:
+    import brotli
+except ImportError:
+    brotli = None
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import NotFound
+from werkzeug.utils import secure_filename
+from werkzeug.security import safe_join
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+# 生成文件（汇报、导出）的保留策略：超过保留天数或总大小超限时，从最久未使用的文件开始清理
+app.config['ARTIFACT_MAX_AGE_DAYS'] = float(os.getenv('ARTIFACT_MAX_AGE_DAYS', '7'))
+app.config['ARTIFACT_MAX_MB'] = float(os.getenv('ARTIFACT_MAX_MB', '500'))
+app.config['ARTIFACT_SWEEP_SECONDS'] = float(os.getenv('ARTIFACT_SWEEP_SECONDS', '3600'))
+# 并行解析上传文件的进程数（默认与CPU核数相同）
+app.config['PARSE_WORKERS'] = int(os.getenv('PARSE_WORKERS', str(os.cpu_count() or 1)))
+# 列式快照目录（按周分区的Feather文件，供汇报和导出使用）
+app.config['SNAPSHOT_DIR'] = os.getenv('SNAPSHOT_DIR', 'data/snapshot')
+# 仪表盘记录片段缓存的最大条数
+app.config['FRAGMENT_CACHE_SIZE'] = int(os.getenv('FRAGMENT_CACHE_SIZE', '100000'))
+# 多周提交统计一次最多统计的周数
+app.config['STATS_MAX_WEEKS'] = int(os.getenv('STATS_MAX_WEEKS', '104'))
+# 项目起始日期，汇报中的第X周以此为第1周计算
+app.config['PROJECT_START_DATE'] = os.getenv('PROJECT_START_DATE', '2026-01-05')
 
 # 初始化Flask-Login
 login_manager = LoginManager()
@@ -23,6 +70,187 @@ login_manager.init_app(app)
 login_manager.login_view = 'login'
 login_manager.login_message = '请先登录以访问该页面'
 
+# 性能分析配置（默认关闭，通过环境变量开启）
+# PROFILE_SAMPLE_RATE：按比例抽样分析请求（0~1）
+# PROFILE_SLOW_MS：耗时超过该阈值（毫秒）的请求也会保留分析结果，0表示不按阈值保留
+#   （请求结束前无法知道是否超过阈值，设置后所有请求都会在cProfile下运行，有明显的额外开销）
+app.config['PROFILE_SAMPLE_RATE'] = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+app.config['PROFILE_SLOW_MS'] = float(os.getenv('PROFILE_SLOW_MS', '0'))
+app.config['PROFILE_DIR'] = os.getenv('PROFILE_DIR', 'profiles')
+app.config['PROFILE_MAX_FILES'] = int(os.getenv('PROFILE_MAX_FILES', '50'))
+
+# 最近的分析记录（内存中保留，供管理员页面查看）
+recent_profiles = deque(maxlen=app.config['PROFILE_MAX_FILES'])
+profile_lock = threading.Lock()
+
+# 提取耗时最多的函数
+def top_profile_functions(stats, limit=10):
+    entries = []
+    for (filename, lineno, func_name), (cc, nc, tt, ct, callers) in stats.stats.items():
+        entries.append({
+            'function': f"{func_name} ({os.path.basename(filename)}:{lineno})",
+            'calls': nc,
+            'total_time': tt,
+            'cumulative_time': ct
+        })
+    entries.sort(key=lambda x: x['cumulative_time'], reverse=True)
+    return entries[:limit]
+
+# 保存分析结果并轮转旧文件
+def save_profile(profiler, elapsed_ms):
+    profile_dir = app.config['PROFILE_DIR']
+    os.makedirs(profile_dir, exist_ok=True)
+
+    endpoint = request.endpoint or 'unknown'
+    filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{endpoint}_{int(elapsed_ms)}ms.pstats"
+    filepath = os.path.join(profile_dir, filename)
+
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(filepath)
+
+    with profile_lock:
+        recent_profiles.append({
+            'filename': filename,
+            'method': request.method,
+            'path': request.path,
+            'endpoint': endpoint,
+            'elapsed_ms': round(elapsed_ms, 1),
+            'time': datetime.now().isoformat(),
+            'top_functions': top_profile_functions(stats)
+        })
+
+        # 只保留最新的若干个分析文件
+        profile_files = sorted(f for f in os.listdir(profile_dir) if f.endswith('.pstats'))
+        for old_file in profile_files[:-app.config['PROFILE_MAX_FILES']]:
+            try:
+                os.remove(os.path.join(profile_dir, old_file))
+            except OSError:
+                pass
+
+# 请求开始时按配置启动分析器
+@app.before_request
+def start_profiler():
+    sample_rate = app.config['PROFILE_SAMPLE_RATE']
+    slow_ms = app.config['PROFILE_SLOW_MS']
+    if sample_rate <= 0 and slow_ms <= 0:
+        return
+
+    g.profile_sampled = random.random() < sample_rate
+    # 设置了慢请求阈值时需要分析所有请求，结束后再决定是否保留
+    if not g.profile_sampled and slow_ms <= 0:
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12起同一时间整个解释器只能有一个分析器，并发的其他请求正在被分析时跳过本请求
+        return
+    g.profiler = profiler
+    g.profile_start = time.perf_counter()
+
+# 请求结束时停止分析器并保存结果
+@app.teardown_request
+def stop_profiler(exc):
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return
+
+    profiler.disable()
+    elapsed_ms = (time.perf_counter() - g.profile_start) * 1000
+    slow_ms = app.config['PROFILE_SLOW_MS']
+    if g.profile_sampled or (slow_ms > 0 and elapsed_ms >= slow_ms):
+        try:
+            save_profile(profiler, elapsed_ms)
+        except Exception as e:
+            print(f"保存性能分析结果失败: {str(e)}")
+
+# 响应压缩配置：小于阈值（字节）的响应不压缩
+app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+app.config['COMPRESS_LEVEL'] = int(os.getenv('COMPRESS_LEVEL', '6'))
+# 流式响应累计至少这么多字节（未压缩）后才刷新一次压缩输出
+app.config['COMPRESS_FLUSH_SIZE'] = int(os.getenv('COMPRESS_FLUSH_SIZE', '16384'))
+
+# 可压缩的内容类型（Excel等已压缩的格式不再压缩）
+COMPRESSIBLE_MIMETYPES = {'text/html', 'text/csv', 'text/plain', 'text/markdown', 'application/json'}
+
+# 根据Accept-Encoding选择压缩方式
+def negotiate_encoding():
+    if brotli is not None and request.accept_encodings['br']:
+        return 'br'
+    if request.accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+# 压缩完整内容
+def compress_bytes(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=app.config['COMPRESS_LEVEL'])
+    return gzip.compress(data, compresslevel=app.config['COMPRESS_LEVEL'], mtime=0)
+
+# 逐块压缩流式响应，累计达到COMPRESS_FLUSH_SIZE后刷新输出以保持流式传输（每个小块都刷新会使压缩率大幅下降）
+def compress_stream(chunks, encoding):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=app.config['COMPRESS_LEVEL'])
+        compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(app.config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)
+        compress, flush, finish = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+    flush_size = app.config['COMPRESS_FLUSH_SIZE']
+    pending = 0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compress(chunk)
+            pending += len(chunk)
+            if pending >= flush_size:
+                data += flush()
+                pending = 0
+            if data:
+                yield data
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+# 按客户端支持的编码压缩响应
+@app.after_request
+def compress_response(response):
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add('Accept-Encoding')
+    
+    # 已压缩的响应（如预压缩的导出文件）只需将ETag标记为弱校验
+    if 'Content-Encoding' in response.headers:
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+    
+    if response.status_code != 200 or response.direct_passthrough or request.method == 'HEAD':
+        return response
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+    
+    if response.is_streamed:
+        # 流式响应长度未知，直接逐块压缩
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(compress_bytes(data, encoding))
+    
+    response.headers['Content-Encoding'] = encoding
+    # 压缩后的内容与原始内容字节不同，ETag改为弱校验
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
 # 用户模型
 class User(UserMixin):
     def __init__(self, id, phone, name, password='123456', role='user'):
@@ -50,6 +278,15 @@ if not os.path.exists(USERS_FILE):
     with open(USERS_FILE, 'w') as f:
         json.dump(default_users, f, ensure_ascii=False, indent=2)
 
+# 写入JSON文件：先写临时文件再替换，避免并发读取到写了一半的文件
+def write_json(path, obj, **kwargs):
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    # 先序列化为字符串再一次写入（json.dump会逐个片段写入文件）
+    text = json.dumps(obj, **kwargs)
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
 # 加载用户数据
 def load_users():
     with open(USERS_FILE, 'r') as f:
@@ -57,8 +294,12 @@ def load_users():
 
 # 保存用户数据
 def save_users(users):
-    with open(USERS_FILE, 'w') as f:
-        json.dump(users, f, ensure_ascii=False, indent=2)
+    previous_stamp = data_file_stamp()
+    write_json(USERS_FILE, users, ensure_ascii=False, indent=2)
+    # 周报数据未变化，索引只需跟进版本号
+    version = bump_data_version(previous_stamp)
+    for index in data_indexes:
+        index.apply((), (), version['version'])
 
 # 根据用户ID加载用户
 @login_manager.user_loader
@@ -102,9 +343,112 @@ class WorkSummaryForm(FlaskForm):
     next_week_plan = TextAreaField('下周工作计划', validators=[DataRequired()])
     submit = SubmitField('提交')
 
+# 周报记录字段（按JSON存储顺序）
+SUMMARY_FIELDS = ('name', 'department', 'start_date', 'end_date', 'core_work', 'completion',
+                  'problems', 'next_week_plan', 'id', 'submission_time', 'user_id')
+
+# 将日期字符串编码为序数，无法解析时保留原值
+def encode_date(value):
+    if isinstance(value, int):
+        return value
+    if isinstance(value, date):
+        return value.toordinal()
+    if not value:
+        return None
+    try:
+        return parse_date_ordinal(value)
+    except (TypeError, ValueError):
+        return value
+
+# 解析YYYY-MM-DD日期字符串为序数；周报日期重复度高，缓存解析结果（同时共享相同的int对象）
+@lru_cache(maxsize=4096)
+def parse_date_ordinal(value):
+    return date.fromisoformat(value).toordinal()
+
+# 将日期序数解码为YYYY-MM-DD字符串
+def decode_date(value):
+    if isinstance(value, int):
+        return format_date_ordinal(value)
+    return value or ''
+
+# 日期序数格式化为YYYY-MM-DD字符串（保存数据时逐条调用，缓存结果）
+@lru_cache(maxsize=4096)
+def format_date_ordinal(value):
+    return date.fromordinal(value).isoformat()
+
+# 获取本周周一和周五的日期序数
+def current_week_ordinals():
+    today = date.today()
+    monday = today.toordinal() - today.weekday()
+    return monday, monday + 4
+
+# 周报记录模型（只保留白名单字段，日期以序数存储）
+class WorkSummary:
+    __slots__ = ('name', 'department', 'start_ordinal', 'end_ordinal', 'core_work', 'completion',
+                 'problems', 'next_week_plan', 'id', 'submission_time', 'user_id')
+
+    def __init__(self, name='', department='', start_date=None, end_date=None, core_work='',
+                 completion='', problems='', next_week_plan='', id=None, submission_time='', user_id=None):
+        # 姓名和部门重复度高，驻留字符串以共享内存
+        self.name = sys.intern(name) if name else ''
+        self.department = sys.intern(department) if department else ''
+        self.start_ordinal = encode_date(start_date)
+        self.end_ordinal = encode_date(end_date)
+        self.core_work = core_work or ''
+        self.completion = completion or ''
+        self.problems = problems or ''
+        self.next_week_plan = next_week_plan or ''
+        self.id = id
+        self.submission_time = submission_time or ''
+        self.user_id = user_id
+
+    # 按位置传入字段，避免为每条记录重建关键字参数字典（加载全部数据时逐条调用）
+    @classmethod
+    def from_dict(cls, data):
+        get = data.get
+        return cls(get('name'), get('department'), get('start_date'), get('end_date'), get('core_work'),
+                   get('completion'), get('problems'), get('next_week_plan'), get('id'),
+                   get('submission_time'), get('user_id'))
+
+    def to_dict(self):
+        record = {
+            'name': self.name,
+            'department': self.department,
+            'start_date': decode_date(self.start_ordinal),
+            'end_date': decode_date(self.end_ordinal),
+            'core_work': self.core_work,
+            'completion': self.completion,
+            'problems': self.problems,
+            'next_week_plan': self.next_week_plan,
+            'id': self.id,
+            'submission_time': self.submission_time
+        }
+        if self.user_id is not None:
+            record['user_id'] = self.user_id
+        return record
+
+    @property
+    def start_date(self):
+        return decode_date(self.start_ordinal)
+
+    @property
+    def end_date(self):
+        return decode_date(self.end_ordinal)
+
+    @property
+    def period_key(self):
+        return (self.start_ordinal, self.end_ordinal)
+
+    @property
+    def is_current_week(self):
+        return self.period_key == current_week_ordinals()
+
 # 数据存储路径
 DATA_FILE = 'data/summaries.json'
 
+# 数据写入锁：读取、修改、保存用户或周报数据并递增版本的整个过程需持有该锁，避免并发写入互相覆盖
+data_lock = threading.RLock()
+
 # 确保数据文件存在
 if not os.path.exists(DATA_FILE):
     with open(DATA_FILE, 'w') as f:
@@ -113,12 +457,979 @@ if not os.path.exists(DATA_FILE):
 # 加载数据
 def load_data():
     with open(DATA_FILE, 'r') as f:
-        return json.load(f)
+        return {key: WorkSummary.from_dict(value) for key, value in json.load(f).items()}
 
-# 保存数据
-def save_data(data):
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+# 保存对数据的修改（removed/added为本次删除的记录ID和新增的记录，同时用于增量维护索引）
+# 只解析和序列化JSON，未修改的记录不构造WorkSummary；修改已有记录时保留其在文件中的位置
+def save_data(removed=(), added=()):
+    previous_stamp = data_file_stamp()
+    with open(DATA_FILE, 'r') as f:
+        data = json.load(f)
+    added_ids = {record.id for record in added}
+    for key in removed:
+        if key not in added_ids:
+            data.pop(key, None)
+    for record in added:
+        data[record.id] = record.to_dict()
+    write_json(DATA_FILE, data, ensure_ascii=False, indent=2)
+    version = bump_data_version(previous_stamp)
+    for index in data_indexes:
+        index.apply(removed, added, version['version'])
+
+# 数据版本文件（每次写入用户或周报数据时递增）
+# stamp为写入后数据文件的状态，previous_stamp为写入前的状态（数据在应用外被修改过时为None）
+VERSION_FILE = 'data/version.json'
+
+# 用户和周报数据文件的状态（修改时间和大小），用于发现应用外的修改（如恢复备份、手工编辑）
+def data_file_stamp():
+    stamps = []
+    for path in (DATA_FILE, USERS_FILE):
+        stat = os.stat(path)
+        stamps.append(f"{stat.st_mtime_ns:x}.{stat.st_size:x}")
+    return '-'.join(stamps)
+
+# 读取版本文件
+def read_version_file():
+    try:
+        with open(VERSION_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'version': 0, 'updated_at': os.path.getmtime(DATA_FILE)}
+
+# 加载数据版本；数据文件在应用外被修改或版本文件丢失时先递增版本
+def load_data_version():
+    version = read_version_file()
+    if version.get('stamp') == data_file_stamp():
+        return version
+    with data_lock:
+        # 本进程正在写入时等待写入完成后重新检查
+        version = read_version_file()
+        stamp = data_file_stamp()
+        if version.get('stamp') != stamp:
+            version = {'version': version['version'] + 1, 'updated_at': time.time(),
+                       'stamp': stamp, 'previous_stamp': None}
+            write_json(VERSION_FILE, version)
+        return version
+
+# 递增数据版本（previous_stamp为本次写入前的数据文件状态）
+def bump_data_version(previous_stamp=None):
+    with data_lock:
+        version = read_version_file()
+        # 写入前数据已在应用外被修改时多递增一次，使增量维护的索引发现版本不连续后重建
+        step = 1 if previous_stamp is not None and version.get('stamp') == previous_stamp else 2
+        version = {'version': version['version'] + step, 'updated_at': time.time(),
+                   'stamp': data_file_stamp(), 'previous_stamp': previous_stamp if step == 1 else None}
+        write_json(VERSION_FILE, version)
+        return version
+
+# 根据数据版本生成ETag和最后修改时间
+def data_version_etag(*parts):
+    # 有待显示的提示消息时页面不可缓存
+    if session.get('_flashes'):
+        return None, None
+    version = load_data_version()
+    # 版本号加上数据文件状态，版本文件丢失后计数重新开始也不会与旧的ETag相同
+    stamp = hashlib.sha1(version['stamp'].encode()).hexdigest()[:12]
+    etag = '-'.join(str(part) for part in parts + (f"v{version['version']}", stamp))
+    last_modified = datetime.fromtimestamp(int(version['updated_at']), timezone.utc)
+    return etag, last_modified
+
+# 判断条件请求是否命中（优先使用If-None-Match）
+def is_not_modified(etag, last_modified):
+    if etag is None:
+        return False
+    if request.if_none_match:
+        # 压缩后的响应使用弱ETag，按弱比较判断
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since:
+        return last_modified <= request.if_modified_since
+    return False
+
+# 返回304响应
+def not_modified_response(etag, last_modified):
+    return add_cache_headers(make_response('', 304), etag, last_modified)
+
+# 添加缓存相关的响应头
+def add_cache_headers(response, etag, last_modified):
+    if etag is None:
+        return response
+    # 同一数据版本的响应内容可能因压缩等不同，统一使用弱ETag（200和304保持一致）
+    response.set_etag(etag, weak=True)
+    response.last_modified = last_modified
+    # 页面与登录用户相关，只允许浏览器缓存且每次需重新验证
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+# 参与全文检索的字段
+SEARCH_FIELDS = ('core_work', 'completion', 'problems', 'next_week_plan')
+
+# 分词：中文按字二元组切分，英文和数字按整词切分
+def tokenize(text):
+    tokens = []
+    for run in re.findall(r'[a-z0-9]+|[\u4e00-\u9fff]+', text.lower()):
+        if run[0] < '\u4e00' or len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+# 随周报数据增量维护的内存索引（子类实现_reset/_add/_remove）
+class DataIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self._reset()
+        data_indexes.append(self)
+
+    # 全量重建索引
+    def rebuild(self, data, version):
+        with self.lock:
+            self._reset()
+            for record in data.values():
+                self._add(record)
+            self.version = version
+
+    # 增量更新索引；索引已过期时等待下次查询时重建
+    def apply(self, removed, added, version):
+        with self.lock:
+            if self.version is None or self.version != version - 1:
+                self.version = None
+                return
+            for record_id in removed:
+                self._remove(record_id)
+            for record in added:
+                self._remove(record.id)
+                self._add(record)
+            self.version = version
+
+    # 索引版本与已保存的数据版本不一致时需要重建
+    def is_stale(self, version):
+        return self.version != version
+
+    # 索引与指定版本一致时返回其持有的全部周报记录（供其他索引重建时共享），默认不提供
+    def current_records(self, version):
+        return None
+
+    # 确保索引与已保存的数据版本一致
+    def ensure_current(self):
+        if self.is_stale(load_data_version()['version']):
+            rebuild_stale_indexes(self)
+
+# 已注册的索引，保存数据时统一更新
+data_indexes = []
+
+# 重建过期的索引：本次查询的索引和其他已在使用中的过期索引一起重建，尚未使用的索引仍在首次查询时再建
+# 记录优先复用其他最新索引中的记录，否则只加载一次数据，各索引共享同一批记录对象
+def rebuild_stale_indexes(requester):
+    with data_lock:
+        version = load_data_version()['version']
+        stale = [index for index in data_indexes
+                 if (index is requester or index.version is not None) and index.is_stale(version)]
+        if not stale:
+            return
+        for index in data_indexes:
+            data = index.current_records(version)
+            if data is not None:
+                break
+        else:
+            data = load_data()
+        for index in stale:
+            index.rebuild(data, version)
+
+# 周报全文检索倒排索引
+class SearchIndex(DataIndex):
+    def _reset(self):
+        self.postings = {}  # 词 -> {记录ID: 词频}；单个汉字的词频包含含该字的二元组词频（用于单字查询）
+        self.tiers = {}  # 词 -> {词频: 记录ID集合}，只记录词频不小于2的记录（用于限定评分范围）
+        self.doc_terms = {}  # 记录ID -> {词: 词频}（删除时使用）
+        self.docs = {}  # 记录ID -> 周报记录
+        self.by_name = {}  # 姓名 -> 记录ID集合
+        self.by_week = {}  # 周一日期序数（日期无法解析或开始晚于结束时为None） -> 按提交时间排序的[(提交时间, 记录ID)]
+        self.bulk = False  # 全量重建期间不逐条保持排序
+
+    # 记录所属的周（开始日期所在周的周一日期序数）
+    @staticmethod
+    def week_of(record):
+        start, end = record.start_ordinal, record.end_ordinal
+        if isinstance(start, int) and isinstance(end, int) and start <= end:
+            return start - date.fromordinal(start).weekday()
+        return None
+
+    def _add(self, record):
+        counts = {}
+        for field in SEARCH_FIELDS:
+            for token in tokenize(getattr(record, field)):
+                counts[token] = counts.get(token, 0) + 1
+        # 二元组的词频同时计入其中每个汉字的单字词频
+        chars = {}
+        for token, count in counts.items():
+            if len(token) == 2 and token[0] >= '\u4e00':
+                chars[token[0]] = chars.get(token[0], 0) + count
+                if token[1] != token[0]:
+                    chars[token[1]] = chars.get(token[1], 0) + count
+        for char, count in chars.items():
+            counts[char] = counts.get(char, 0) + count
+        for token, count in counts.items():
+            self.postings.setdefault(token, {})[record.id] = count
+            if count > 1:
+                self.tiers.setdefault(token, {}).setdefault(count, set()).add(record.id)
+        self.doc_terms[record.id] = counts
+        self.docs[record.id] = record
+        self.by_name.setdefault(record.name, set()).add(record.id)
+        week = self.by_week.setdefault(self.week_of(record), [])
+        if self.bulk:
+            week.append((record.submission_time, record.id))
+        else:
+            bisect.insort(week, (record.submission_time, record.id))
+
+    def _remove(self, record_id):
+        for token, count in self.doc_terms.pop(record_id, {}).items():
+            posting = self.postings[token]
+            del posting[record_id]
+            if not posting:
+                del self.postings[token]
+            if count > 1:
+                tiers = self.tiers[token]
+                tiers[count].discard(record_id)
+                if not tiers[count]:
+                    del tiers[count]
+                    if not tiers:
+                        del self.tiers[token]
+        record = self.docs.pop(record_id, None)
+        if record is not None:
+            names = self.by_name[record.name]
+            names.discard(record_id)
+            if not names:
+                del self.by_name[record.name]
+            key = self.week_of(record)
+            week = self.by_week[key]
+            del week[bisect.bisect_left(week, (record.submission_time, record_id))]
+            if not week:
+                del self.by_week[key]
+
+    # 全量重建时最后统一按提交时间排序，避免逐条插入有序列表
+    def rebuild(self, data, version):
+        with self.lock:
+            self._reset()
+            self.bulk = True
+            for record in data.values():
+                self._add(record)
+            for week in self.by_week.values():
+                week.sort()
+            self.bulk = False
+            self.version = version
+
+    # 可能满足周期过滤条件的周：开始日期不早于start的记录所在周一不早于start - 6，
+    # 结束日期不晚于end的记录所在周一不晚于end；开始晚于结束等异常记录都需要检查
+    def _weeks(self, start, end):
+        return [week for week in self.by_week
+                if week is None or ((start is None or week >= start - 6) and (end is None or week <= end))]
+
+    # 检索同时包含所有查询词的记录，按TF-IDF排序（分数相同时较新的提交在前）
+    def search(self, query, name=None, start=None, end=None, limit=20):
+        tokens = set(tokenize(query))
+        if not tokens or limit <= 0:
+            return []
+
+        self.ensure_current()
+        with self.lock:
+            terms = sorted(tokens, key=lambda token: len(self.postings.get(token, ())))
+            postings = [self.postings.get(token, {}) for token in terms]
+            if not postings[0]:
+                return []
+
+            total = len(self.docs)
+            weights = [(posting, math.log(1 + total / len(posting))) for posting in postings]
+
+            def matches(record):
+                if name is not None and record.name != name:
+                    return False
+                if start is not None and not (isinstance(record.start_ordinal, int) and record.start_ordinal >= start):
+                    return False
+                if end is not None and not (isinstance(record.end_ordinal, int) and record.end_ordinal <= end):
+                    return False
+                return all(record.id in posting for posting in postings)
+
+            def score_of(record_id):
+                return sum(posting[record_id] * weight for posting, weight in weights)
+
+            # 候选记录取姓名、周期和最短倒排列表中范围最小的一个
+            weeks = self._weeks(start, end) if start is not None or end is not None else list(self.by_week)
+            sizes = [(len(postings[0]), 'term')]
+            if name:
+                sizes.append((len(self.by_name.get(name, ())), 'name'))
+            if start is not None or end is not None:
+                sizes.append((sum(len(self.by_week[week]) for week in weeks), 'week'))
+            size, source = min(sizes)
+
+            # 候选记录较少时直接逐条评分
+            # 否则词频高的少数记录单独评分，其余记录的分数不超过上界，按提交时间从新到旧遍历范围内的各周，前limit条不会再变化时停止
+            cap = math.sqrt(limit * total)
+            if size <= cap:
+                if source == 'name':
+                    candidates = self.by_name.get(name, ())
+                elif source == 'week':
+                    candidates = [record_id for week in weeks for _, record_id in self.by_week[week]]
+                else:
+                    candidates = postings[0].keys()
+                scored = [(score_of(record_id), self.docs[record_id].submission_time, record_id)
+                          for record_id in candidates if matches(self.docs[record_id])]
+                top = heapq.nlargest(limit, scored)
+            else:
+                outliers = set()
+                bound = 0
+                for term, (posting, weight) in zip(terms, weights):
+                    tiers = self.tiers.get(term, {})
+                    base = 1
+                    count = 0
+                    for tf in sorted(tiers, reverse=True):
+                        if count + len(tiers[tf]) > cap:
+                            base = tf
+                            break
+                        count += len(tiers[tf])
+                        outliers |= tiers[tf]
+                    bound += base * weight
+
+                top = [(score_of(record_id), self.docs[record_id].submission_time, record_id)
+                       for record_id in outliers if matches(self.docs[record_id])]
+                top = heapq.nlargest(limit, top)
+                heapq.heapify(top)
+                for submission_time, record_id in heapq.merge(*(reversed(self.by_week[week]) for week in weeks),
+                                                              reverse=True):
+                    if len(top) == limit and top[0][:2] >= (bound, submission_time):
+                        break
+                    if record_id in outliers or not matches(self.docs[record_id]):
+                        continue
+                    item = (score_of(record_id), submission_time, record_id)
+                    if len(top) < limit:
+                        heapq.heappush(top, item)
+                    elif item > top[0]:
+                        heapq.heapreplace(top, item)
+                top = sorted(top, reverse=True)
+
+            return [(score, self.docs[record_id]) for score, _, record_id in top]
+
+search_index = SearchIndex()
+
+# 按周期增量维护的提交统计
+class SubmissionIndex(DataIndex):
+    def _reset(self):
+        self.records = {}  # 记录ID -> 周报记录
+        self.periods = {}  # 周期 -> {姓名: {记录ID: 周报记录}}
+        self.latest = {}  # 姓名 -> 最近提交的周报记录（用于确定所属部门）
+        self.by_name = {}  # 姓名 -> {记录ID: 周报记录}
+
+    def _add(self, record):
+        self.records[record.id] = record
+        self.periods.setdefault(record.period_key, {}).setdefault(record.name, {})[record.id] = record
+        self.by_name.setdefault(record.name, {})[record.id] = record
+        latest = self.latest.get(record.name)
+        if latest is None or record.submission_time >= latest.submission_time:
+            self.latest[record.name] = record
+
+    def _remove(self, record_id):
+        record = self.records.pop(record_id, None)
+        if record is None:
+            return
+        submitters = self.periods[record.period_key]
+        del submitters[record.name][record_id]
+        if not submitters[record.name]:
+            del submitters[record.name]
+            if not submitters:
+                del self.periods[record.period_key]
+        user_records = self.by_name[record.name]
+        del user_records[record_id]
+        if not user_records:
+            del self.by_name[record.name]
+            del self.latest[record.name]
+        elif self.latest[record.name] is record:
+            self.latest[record.name] = max(user_records.values(), key=lambda x: x.submission_time)
+
+    def current_records(self, version):
+        with self.lock:
+            return dict(self.records) if self.version == version else None
+
+    # 获取全部周报记录
+    def all_records(self):
+        self.ensure_current()
+        with self.lock:
+            return list(self.records.values())
+
+    # 获取某用户的全部周报记录
+    def user_records(self, name):
+        self.ensure_current()
+        with self.lock:
+            return list(self.by_name.get(name, {}).values())
+
+    # 获取单条周报记录
+    def get(self, record_id):
+        self.ensure_current()
+        with self.lock:
+            return self.records.get(record_id)
+
+    # 获取某用户某周期的全部记录ID
+    def period_record_ids(self, name, period_key):
+        self.ensure_current()
+        with self.lock:
+            return list(self.periods.get(period_key, {}).get(name, {}))
+
+    # 获取某周期的提交人及其最后一次提交
+    def submitters(self, period_key):
+        self.ensure_current()
+        with self.lock:
+            return {name: max(records.values(), key=lambda x: x.submission_time)
+                    for name, records in self.periods.get(period_key, {}).items()}
+
+    # 生成用户×周的提交矩阵、迟交记录和各部门提交率
+    def report(self, names, start, end):
+        self.ensure_current()
+        mondays = list(range(start - date.fromordinal(start).weekday(), end + 1, 7))
+
+        with self.lock:
+            weeks = [self.periods.get((monday, monday + 4), {}) for monday in mondays]
+            # 晚于周期结束当天（周五）提交视为迟交
+            deadlines = [f"{decode_date(monday + 5)}T00:00:00" for monday in mondays]
+            users = []
+            late_submissions = []
+            departments = {}
+            weekly_submitted = [0] * len(mondays)
+            for name in names:
+                latest = self.latest.get(name)
+                department = latest.department if latest else '未知'
+                submissions = []
+                for i, (monday, submitters, deadline) in enumerate(zip(mondays, weeks, deadlines)):
+                    records = submitters.get(name)
+                    if not records:
+                        submissions.append(None)
+                        continue
+                    record = max(records.values(), key=lambda x: x.submission_time)
+                    submissions.append(record.submission_time)
+                    weekly_submitted[i] += 1
+
+                    if record.submission_time > deadline:
+                        try:
+                            late_hours = (datetime.fromisoformat(record.submission_time)
+                                          - datetime.fromisoformat(deadline)).total_seconds() / 3600
+                        except ValueError:
+                            late_hours = 0
+                        late_submissions.append({
+                            'name': name,
+                            'week': decode_date(monday),
+                            'submission_time': record.submission_time,
+                            'late_hours': round(late_hours, 1)
+                        })
+
+                stats = departments.setdefault(department, {'department': department, 'members': 0, 'submitted': 0})
+                stats['members'] += 1
+                stats['submitted'] += len(mondays) - submissions.count(None)
+                users.append({'name': name, 'department': department, 'submissions': submissions})
+
+        for stats in departments.values():
+            stats['expected'] = stats['members'] * len(mondays)
+            stats['rate'] = round(stats['submitted'] / stats['expected'], 4) if stats['expected'] else 0
+
+        return {
+            'weeks': [decode_date(monday) for monday in mondays],
+            'users': users,
+            'weekly': [{'week': decode_date(monday), 'submitted': count, 'total': len(names),
+                        'rate': round(count / len(names), 4) if names else 0}
+                       for monday, count in zip(mondays, weekly_submitted)],
+            'departments': sorted(departments.values(), key=lambda x: x['department']),
+            'late_submissions': late_submissions
+        }
+
+submission_index = SubmissionIndex()
+
+# 快照中按字典编码（pandas categorical）存储的列
+CATEGORICAL_FIELDS = ('name', 'department', 'start_date', 'end_date', 'user_id')
+
+# 快照分区的arrow表结构（字典编码列读取为pandas categorical）
+SNAPSHOT_SCHEMA = pa.schema([(field, pa.dictionary(pa.int32(), pa.string()) if field in CATEGORICAL_FIELDS else pa.string())
+                             for field in SUMMARY_FIELDS])
+
+# 周报数据的列式快照：按周一分区保存为Feather文件，增量更新受影响的分区
+class ColumnarSnapshot(DataIndex):
+    def _reset(self):
+        self.locations = {}  # 记录ID -> 分区
+        self.removed = {}  # 分区 -> 待删除的记录ID集合
+        self.added = {}  # 分区 -> {记录ID: 待写入的周报记录}
+
+    # 记录所属分区：周一的日期序数，无法解析日期的记录归入other分区
+    @staticmethod
+    def partition_of(record):
+        if isinstance(record.start_ordinal, int):
+            return str(record.start_ordinal - date.fromordinal(record.start_ordinal).weekday())
+        return 'other'
+
+    def _path(self, partition):
+        return os.path.join(app.config['SNAPSHOT_DIR'], f"week_{partition}.feather")
+
+    def _manifest_path(self):
+        return os.path.join(app.config['SNAPSHOT_DIR'], 'manifest.json')
+
+    # 磁盘上已有的分区，快照目录不存在时返回空列表
+    def _partitions(self):
+        try:
+            files = os.listdir(app.config['SNAPSHOT_DIR'])
+        except FileNotFoundError:
+            return []
+        return [f[5:-8] for f in files if f.startswith('week_') and f.endswith('.feather')]
+
+    def _add(self, record):
+        partition = self.partition_of(record)
+        self.locations[record.id] = partition
+        self.added.setdefault(partition, {})[record.id] = record
+
+    def _remove(self, record_id):
+        partition = self.locations.pop(record_id, None)
+        if partition is not None:
+            self.removed.setdefault(partition, set()).add(record_id)
+            self.added.get(partition, {}).pop(record_id, None)
+
+    # 将周报记录转换为带字典编码列的arrow表
+    @staticmethod
+    def _to_table(records):
+        records = list(records)
+        return pa.Table.from_pydict({field: [getattr(record, field) for record in records] for field in SUMMARY_FIELDS},
+                                    schema=SNAPSHOT_SCHEMA)
+
+    # 写入有变化的分区和清单文件；replace为True时不合并分区中已有的数据，obsolete为需要删除的分区
+    # 直接合并arrow表，不经过pandas转换
+    def _flush(self, replace=False, obsolete=()):
+        for partition in set(self.removed) | set(self.added):
+            path = self._path(partition)
+            removed = self.removed.get(partition, set())
+            added = self.added.get(partition, {})
+            tables = []
+            if not replace and os.path.exists(path):
+                existing = feather.read_table(path).select(list(SUMMARY_FIELDS)).cast(SNAPSHOT_SCHEMA)
+                keep = pc.invert(pc.is_in(existing.column('id'), value_set=pa.array(list(removed | added.keys()), pa.string())))
+                tables.append(existing.filter(keep))
+            if added:
+                tables.append(self._to_table(added.values()))
+            
+            tables = [table for table in tables if table.num_rows]
+            if not tables:
+                if os.path.exists(path):
+                    os.remove(path)
+                continue
+            # 合并为单个分块，各字典编码列共用一个字典
+            table = pa.concat_tables(tables).unify_dictionaries().combine_chunks()
+            # 先写临时文件再替换，避免读取到写了一半的分区（其他进程可能同时读取）
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, path)
+        for partition in obsolete:
+            try:
+                os.remove(self._path(partition))
+            except FileNotFoundError:
+                pass
+        self.removed, self.added = {}, {}
+        # 同时记录该版本对应的数据文件状态和分区列表，使用和恢复时据此确认快照与数据文件一致、分区文件完整
+        write_json(self._manifest_path(), {'version': self.version, 'stamp': self._stamp_of(self.version),
+                                           'partitions': sorted(self._partitions())})
+
+    # 全量重建所有分区：逐个替换分区文件，最后删除已不存在数据的分区
+    def rebuild(self, data, version):
+        with self.lock:
+            os.makedirs(app.config['SNAPSHOT_DIR'], exist_ok=True)
+            self._reset()
+            for record in data.values():
+                self._add(record)
+            obsolete = set(self._partitions()) - set(self.added)
+            self.version = version
+            self._flush(replace=True, obsolete=obsolete)
+
+    # 版本文件中指定版本对应的数据文件状态；previous为True时取该版本写入前的状态
+    @staticmethod
+    def _stamp_of(version, previous=False):
+        current = read_version_file()
+        if current['version'] != version:
+            return None
+        return current.get('previous_stamp' if previous else 'stamp')
+
+    # 按增量更新分区；快照版本落后（进程重启或其他进程已写入）或磁盘上的快照不完整时先从清单恢复
+    def apply(self, removed, added, version):
+        with self.lock:
+            self._check_disk(version - 1, self._stamp_of(version, previous=True))
+        super().apply(removed, added, version)
+        with self.lock:
+            if self.version == version:
+                self._flush()
+
+    # 快照版本落后（进程重启或其他进程已写入）或磁盘上的快照不完整时先尝试从清单恢复，清单也过期时才需要重建
+    def is_stale(self, version):
+        with self.lock:
+            self._check_disk(version, self._stamp_of(version))
+            return self.version != version
+
+    # 内存中的版本与预期一致但快照目录、清单或分区文件已被删除或替换时丢弃内存状态，否则版本落后时从清单恢复
+    def _check_disk(self, expected_version, expected_stamp):
+        if self.version == expected_version:
+            if self._read_manifest(expected_version, expected_stamp) is not None:
+                return
+            self._reset()
+            self.version = None
+        self._load_manifest(expected_version, expected_stamp)
+
+    # 读取清单；清单中的版本、数据文件状态和分区列表都与预期及磁盘一致时返回清单，否则返回None
+    # （只比较版本号时，数据文件在应用外被替换或版本文件丢失后会误用旧快照）
+    def _read_manifest(self, expected_version, expected_stamp):
+        try:
+            with open(self._manifest_path(), 'r') as f:
+                manifest = json.load(f)
+            version = manifest['version']
+            partitions = manifest['partitions']
+        except (OSError, ValueError, KeyError):
+            return None
+        if version != expected_version or expected_stamp is None or manifest.get('stamp') != expected_stamp:
+            return None
+        if sorted(partitions) != sorted(self._partitions()):
+            return None
+        return manifest
+
+    # 磁盘上的快照与预期一致时，只读取各分区的id列恢复记录位置
+    def _load_manifest(self, expected_version, expected_stamp):
+        manifest = self._read_manifest(expected_version, expected_stamp)
+        if manifest is None:
+            return
+        version = manifest['version']
+        locations = {}
+        try:
+            for partition in self._partitions():
+                for record_id in feather.read_table(self._path(partition), columns=['id'], memory_map=True).column('id').to_pylist():
+                    locations[record_id] = partition
+        except OSError:
+            # 其他进程正在更新分区，按过期处理
+            return
+        self._reset()
+        self.locations = locations
+        self.version = version
+
+    # 有数据的最近一周（周一日期序数），没有日期可解析的数据时返回None
+    def latest_week(self):
+        self.ensure_current()
+        with self.lock:
+            weeks = [int(partition) for partition in self._partitions() if partition != 'other']
+        return max(weeks, default=None)
+
+    # 读取指定列和周期范围（按周一日期序数）内的数据
+    def load(self, columns=SUMMARY_FIELDS, start=None, end=None):
+        self.ensure_current()
+        with self.lock:
+            tables = []
+            for partition in sorted(self._partitions()):
+                if start is not None or end is not None:
+                    if partition == 'other':
+                        continue
+                    if (start is not None and int(partition) < start) or (end is not None and int(partition) > end):
+                        continue
+                tables.append(feather.read_table(self._path(partition), columns=list(columns), memory_map=True))
+        if not tables:
+            return pd.DataFrame(columns=list(columns))
+        return pa.concat_tables(tables, promote_options='permissive').to_pandas()
+
+snapshot = ColumnarSnapshot()
+
+# 生成文件的写入锁（与后台清理互斥）
+artifact_lock = threading.Lock()
+
+# 生成文件的临时文件标记（进程和线程独有，避免并发写入同一个临时文件）
+def artifact_tmp_suffix():
+    return f"{os.getpid()}-{threading.get_ident()}.tmp"
+
+# 按内容哈希保存生成的文件，相同内容只写入一次
+# content为计算哈希的内容；write(path)用于写入实际文件，未提供时直接写入content
+def store_artifact(content, ext, write=None):
+    digest = hashlib.sha256(content).hexdigest()[:32]
+    filename = f"{digest}.{ext}"
+    path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    
+    with artifact_lock:
+        if os.path.exists(path):
+            # 更新使用时间，延后清理
+            os.utime(path)
+            return filename
+    
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    # 先在锁外写入本线程独有的临时文件再替换，避免下载到写了一半的文件，写入期间也不阻塞其他下载和清理
+    tmp_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{digest}.{artifact_tmp_suffix()}.{ext}")
+    try:
+        if write:
+            write(tmp_path)
+        else:
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+        with artifact_lock:
+            os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return filename
+
+# 发送生成的文件，客户端支持时发送预压缩的版本（与原文件一起按内容哈希缓存）
+def send_artifact(filename, download_name=None, **kwargs):
+    folder = app.config['UPLOAD_FOLDER']
+    path = safe_join(folder, filename)
+    if path is None:
+        raise NotFound()
+    with artifact_lock:
+        # 每次发送都更新原文件的使用时间，延后清理（压缩版本随原文件一起清理）
+        try:
+            os.utime(path)
+        except OSError:
+            raise NotFound()
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = negotiate_encoding()
+    if (encoding is None or mimetype not in COMPRESSIBLE_MIMETYPES
+            or os.path.getsize(path) < app.config['COMPRESS_MIN_SIZE']):
+        return send_from_directory(folder, filename, as_attachment=True, download_name=download_name, **kwargs)
+    
+    compressed_filename = f"{filename}.{'br' if encoding == 'br' else 'gz'}"
+    compressed_path = os.path.join(folder, compressed_filename)
+    with artifact_lock:
+        exists = os.path.exists(compressed_path)
+        if exists:
+            os.utime(compressed_path)
+    if not exists:
+        # 在锁外读取和压缩，写入本线程独有的临时文件后再替换
+        with open(path, 'rb') as f:
+            data = compress_bytes(f.read(), encoding)
+        tmp_path = f"{compressed_path}.{artifact_tmp_suffix()}"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            with artifact_lock:
+                os.replace(tmp_path, compressed_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    response = send_from_directory(folder, compressed_filename, as_attachment=True,
+                                   download_name=download_name or filename, mimetype=mimetype, **kwargs)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+# 清理过期和超出总大小限制的生成文件
+def sweep_artifacts():
+    folder = app.config['UPLOAD_FOLDER']
+    if not os.path.isdir(folder):
+        return
+    
+    max_age = app.config['ARTIFACT_MAX_AGE_DAYS'] * 86400
+    max_bytes = app.config['ARTIFACT_MAX_MB'] * 1024 * 1024
+    now = time.time()
+    
+    with artifact_lock:
+        # 原文件和其压缩版本（.gz/.br）作为一组，按组内最近使用时间一起清理
+        groups = {}
+        for entry in os.scandir(folder):
+            if entry.is_file():
+                stat = entry.stat()
+                # 正在写入的临时文件不计入总大小，只清理异常退出后遗留的过期临时文件
+                if '.tmp' in entry.name:
+                    if now - stat.st_mtime > max_age:
+                        try:
+                            os.remove(entry.path)
+                        except OSError:
+                            pass
+                    continue
+                base, ext = os.path.splitext(entry.path)
+                key = base if ext in ('.gz', '.br') else entry.path
+                group = groups.setdefault(key, [0, 0, []])
+                group[0] = max(group[0], stat.st_mtime)
+                group[1] += stat.st_size
+                group[2].append(entry.path)
+        
+        # 最久未使用的排在前面
+        files = sorted(groups.values())
+        total = sum(size for _, size, _ in files)
+        for mtime, size, paths in files:
+            if now - mtime <= max_age and total <= max_bytes:
+                break
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+
+# 后台定期清理生成文件
+def artifact_sweeper():
+    while True:
+        try:
+            sweep_artifacts()
+        except Exception as e:
+            print(f"清理生成文件失败: {str(e)}")
+        time.sleep(app.config['ARTIFACT_SWEEP_SECONDS'])
+
+artifact_sweeper_thread = None
+
+# 处理第一个请求时启动清理线程（不在导入时启动：以python app.py运行时，解析子进程会重新导入本文件）
+@app.before_request
+def start_artifact_sweeper():
+    global artifact_sweeper_thread
+    if artifact_sweeper_thread is None:
+        with artifact_lock:
+            if artifact_sweeper_thread is None:
+                artifact_sweeper_thread = threading.Thread(target=artifact_sweeper, name='artifact-sweeper', daemon=True)
+                artifact_sweeper_thread.start()
+
+# 解析进程池（首次使用时创建）
+# 子进程通过forkserver创建（不支持的平台如Windows使用spawn）：从多线程的应用进程直接fork可能死锁
+# 解析函数位于没有副作用的report_parser模块，子进程无需导入app.py（以python app.py运行时除外，此时导入本文件只定义函数和路由，不会启动线程）
+parse_pool = None
+# 进程池的创建、替换和关闭需持有该锁，避免并发上传各自创建进程池
+parse_pool_lock = threading.Lock()
+
+# 并行解析多个上传文件，返回[(文件名, DataFrame, 错误信息)]
+def parse_report_files(files):
+    global parse_pool
+    filenames = [filename for filename, _ in files]
+    contents = [content for _, content in files]
+    
+    # 单个文件直接在当前进程解析，避免进程间传输开销
+    if len(files) == 1 or app.config['PARSE_WORKERS'] <= 1:
+        results = map(parse_report_file, filenames, contents)
+        return [(filename, df, error) for filename, (df, error) in zip(filenames, results)]
+    
+    futures = []
+    pool = None
+    with parse_pool_lock:
+        for attempt in range(2):
+            if parse_pool is None:
+                if 'forkserver' in multiprocessing.get_all_start_methods():
+                    context = multiprocessing.get_context('forkserver')
+                    context.set_forkserver_preload(['report_parser'])
+                else:
+                    # Windows不支持forkserver，改用spawn（解析函数所在模块没有副作用，同样安全）
+                    context = multiprocessing.get_context('spawn')
+                parse_pool = ProcessPoolExecutor(max_workers=app.config['PARSE_WORKERS'], mp_context=context)
+            pool = parse_pool
+            try:
+                futures = [pool.submit(parse_report_file, filename, content) for filename, content in files]
+                break
+            except BrokenProcessPool:
+                # 进程池在空闲期间已损坏（子进程被终止），重新创建后重试
+                pool.shutdown(wait=False, cancel_futures=True)
+                parse_pool = None
+    if not futures:
+        return [(filename, None, '文件解析进程启动失败，请稍后重试') for filename in filenames]
+    
+    parsed = []
+    broken = False
+    for filename, future in zip(filenames, futures):
+        try:
+            df, error = future.result()
+        except BrokenProcessPool:
+            # 子进程异常退出（如解析时内存不足），进程池已不可用，未完成的文件记为失败
+            broken = True
+            df, error = None, '文件解析进程异常退出，请检查文件后重新上传'
+        except Exception as e:
+            df, error = None, f'文件解析失败：{str(e)}'
+        parsed.append((filename, df, error))
+    
+    # 丢弃已损坏的进程池，下次上传时重新创建（其他请求可能已经替换）
+    if broken:
+        with parse_pool_lock:
+            pool.shutdown(wait=False, cancel_futures=True)
+            if parse_pool is pool:
+                parse_pool = None
+    return parsed
+
+# 计算项目第X周（以项目起始日期所在周为第1周）
+def project_week_number(day_ordinal):
+    project_start = date.fromisoformat(app.config['PROJECT_START_DATE'])
+    # 对齐到起始日期所在周的周一
+    project_monday = project_start.toordinal() - project_start.weekday()
+    return (day_ordinal - project_monday) // 7 + 1
+
+# 多周汇报导出的列（字段名 -> 中文表头）
+RANGE_REPORT_COLUMNS = {
+    'week_number': '周次',
+    'start_date': '开始日期',
+    'end_date': '结束日期',
+    'name': '姓名',
+    'department': '部门',
+    'core_work': '本周核心工作内容',
+    'completion': '完成情况',
+    'problems': '遇到的问题',
+    'next_week_plan': '下周工作计划',
+    'submission_time': '提交时间'
+}
+
+# 生成多周汇报（一次排序分组生成每周每人的汇报内容）
+def build_range_report(df):
+    if df.empty:
+        return None, None
+    
+    # 分类列转为字符串，便于排序和拼接
+    df = df.astype({'name': str, 'department': str, 'start_date': str, 'end_date': str})
+    
+    # 处理重复提交（同一人同一周以最后一次为准，开始日期不同的记录按所在周次合并），并按周次、姓名排序
+    df['week_number'] = df['start_date'].map(lambda x: project_week_number(date.fromisoformat(x).toordinal()))
+    df = df.sort_values(by=['week_number', 'name', 'submission_time'])
+    df = df.drop_duplicates(subset=['week_number', 'name'], keep='last')
+    df['completion'] = df['completion'].map(normalize_completion)
+    
+    first = df.iloc[0]
+    last = df.iloc[-1]
+    report_content = (f"# 开源鸿蒙系统研发能力提升第{first['week_number']}-{last['week_number']}周工作总结"
+                      f"（{first['start_date'].replace('-', '')}-{last['end_date'].replace('-', '')}）\n\n")
+    
+    for week_number, week_df in df.groupby('week_number', sort=False):
+        week_start = week_df['start_date'].iloc[0].replace('-', '')
+        week_end = week_df['end_date'].iloc[0].replace('-', '')
+        report_content += f"## 第{week_number}周（{week_start}-{week_end}）\n\n"
+        
+        summary_lines = []
+        plan_lines = []
+        for i, row in enumerate(week_df.itertuples(index=False), 1):
+            summary = f"{row.core_work}，{row.completion}"
+            if row.problems:
+                summary += f"。遇到的问题：{row.problems}"
+            summary_lines.append(f"（{i}）{row.name}：{summary}。\n")
+            plan_lines.append(f"（{i}）{row.name}：{row.next_week_plan}。\n")
+        
+        report_content += "### 上周工作总结：\n\n" + ''.join(summary_lines)
+        report_content += "\n### 本周工作计划：\n\n" + ''.join(plan_lines) + "\n"
+    
+    report_df = df[list(RANGE_REPORT_COLUMNS)].rename(columns=RANGE_REPORT_COLUMNS)
+    return report_content, report_df
+
+# 生成多周汇报页面
+def generate_range_report():
+    start = encode_date(request.form.get('start_date'))
+    end = encode_date(request.form.get('end_date'))
+    if not isinstance(start, int) or not isinstance(end, int) or start > end:
+        flash('请选择有效的开始周和结束周')
+        return redirect(url_for('generate_report'))
+    
+    # 按所在周的周一对齐
+    start -= date.fromordinal(start).weekday()
+    end -= date.fromordinal(end).weekday()
+    
+    report_content, report_df = build_range_report(snapshot.load(
+        ['name', 'department', 'start_date', 'end_date', 'core_work', 'completion',
+         'problems', 'next_week_plan', 'submission_time'], start, end))
+    if report_content is None:
+        flash('所选周期内没有找到提交数据')
+        return redirect(url_for('generate_report'))
+    
+    # 保存汇报内容和汇总表格（Excel文件内含生成时间，按表格数据计算哈希）
+    def write_excel(path):
+        with pd.ExcelWriter(path) as writer:
+            report_df.to_excel(writer, sheet_name='按周汇总', index=False)
+            report_df.sort_values(by=['姓名', '周次']).to_excel(writer, sheet_name='按人员汇总', index=False)
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    report_filename = store_artifact(report_content.encode('utf-8'), 'md')
+    excel_filename = store_artifact(report_df.to_csv(index=False).encode('utf-8'), 'xlsx', write_excel)
+    
+    return render_template('result.html', report_content=report_content,
+                           report_filename=report_filename, report_download_name=f"report_{timestamp}.md",
+                           excel_filename=excel_filename, excel_download_name=f"report_{timestamp}.xlsx")
 
 # 规范化完成情况描述
 def normalize_completion(text):
@@ -151,32 +1462,33 @@ def login():
     if form.validate_on_submit():
         phone = form.phone.data
         password = form.password.data
-        users = load_users()
-        
-        # 查找用户
-        for user_id, user_data in users.items():
-            if user_data['phone'] == phone:
-                # 验证密码
-                if user_data.get('password', '123456') == password:
-                    user = User(user_data['id'], user_data['phone'], user_data['name'], user_data.get('password', '123456'), user_data['role'])
-                    login_user(user)
-                    flash('登录成功！', 'success')
-                    return redirect(url_for('dashboard'))
-                else:
-                    flash('密码错误！', 'error')
-                    return redirect(url_for('login'))
-        
-        # 如果用户不存在，自动创建新用户
-        new_user_id = str(len(users) + 1)
-        new_user = {
-            'id': new_user_id,
-            'phone': phone,
-            'name': f'用户{new_user_id}',
-            'password': password,
-            'role': 'user'
-        }
-        users[new_user_id] = new_user
-        save_users(users)
+        with data_lock:
+            users = load_users()
+            
+            # 查找用户
+            for user_id, user_data in users.items():
+                if user_data['phone'] == phone:
+                    # 验证密码
+                    if user_data.get('password', '123456') == password:
+                        user = User(user_data['id'], user_data['phone'], user_data['name'], user_data.get('password', '123456'), user_data['role'])
+                        login_user(user)
+                        flash('登录成功！', 'success')
+                        return redirect(url_for('dashboard'))
+                    else:
+                        flash('密码错误！', 'error')
+                        return redirect(url_for('login'))
+            
+            # 如果用户不存在，自动创建新用户
+            new_user_id = str(len(users) + 1)
+            new_user = {
+                'id': new_user_id,
+                'phone': phone,
+                'name': f'用户{new_user_id}',
+                'password': password,
+                'role': 'user'
+            }
+            users[new_user_id] = new_user
+            save_users(users)
         
         login_user(User(new_user_id, phone, new_user['name'], new_user['password'], 'user'))
         return redirect(url_for('dashboard'))
@@ -204,10 +1516,11 @@ def user_info():
             flash('密码错误！', 'error')
             return redirect(url_for('user_info'))
         
-        # 更新用户信息
-        user_data['name'] = form.name.data
-        users[current_user.id] = user_data
-        save_users(users)
+        # 更新用户信息（重新读取最新数据后修改）
+        with data_lock:
+            users = load_users()
+            users[current_user.id]['name'] = form.name.data
+            save_users(users)
         
         # 更新当前用户对象
         current_user.name = form.name.data
@@ -236,31 +1549,41 @@ def dashboard():
 @login_required
 def user_dashboard():
     # 获取用户历史提交记录
-    data = load_data()
-    user_records = [v for v in data.values() if v.get('name') == current_user.name]
-    
-    # 判断是否为本周
-    def is_current_week(start_date_str, end_date_str):
-        today = datetime.now()
-        current_monday = today - timedelta(days=today.weekday())
-        current_friday = current_monday + timedelta(days=4)
-        
-        # 格式化日期字符串为日期对象
-        try:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-            return start_date == current_monday.date() and end_date == current_friday.date()
-        except:
-            return False
-    
-    # 为每条记录添加是否为本周的标记
-    for record in user_records:
-        record['is_current_week'] = is_current_week(record.get('start_date'), record.get('end_date'))
+    user_records = submission_index.user_records(current_user.name)
     
     # 按提交时间排序
-    user_records.sort(key=lambda x: x.get('submission_time', ''), reverse=True)
+    user_records.sort(key=lambda x: x.submission_time, reverse=True)
     
-    return render_template('user_dashboard.html', user=current_user, records=user_records)
+    return render_template('user_dashboard.html', user=current_user, records=user_records,
+                           records_html=render_record_fragments('_user_record.html', user_records))
+
+# 已渲染的记录片段（LRU），键为(模板, 记录ID, 提交时间)
+fragment_cache = OrderedDict()
+fragment_lock = threading.Lock()
+
+# 渲染记录列表：本周记录可修改，每次重新渲染；往周记录不再变化，使用缓存的片段
+def render_record_fragments(template_name, records):
+    template = app.jinja_env.get_template(template_name)
+    fragments = []
+    for record in records:
+        if record.is_current_week:
+            fragments.append(template.render(record=record))
+            continue
+        
+        key = (template_name, record.id, record.submission_time)
+        with fragment_lock:
+            fragment = fragment_cache.get(key)
+            if fragment is not None:
+                fragment_cache.move_to_end(key)
+        if fragment is None:
+            fragment = template.render(record=record)
+            with fragment_lock:
+                fragment_cache[key] = fragment
+                if len(fragment_cache) > app.config['FRAGMENT_CACHE_SIZE']:
+                    fragment_cache.popitem(last=False)
+        fragments.append(fragment)
+    # 片段由开启自动转义的模板渲染，可安全拼接
+    return Markup(''.join(fragments))
 
 # 管理员仪表盘
 @app.route('/admin_dashboard')
@@ -270,13 +1593,22 @@ def admin_dashboard():
         flash('您没有权限访问此页面')
         return redirect(url_for('user_dashboard'))
     
-    # 获取所有提交记录
-    data = load_data()
-    all_records = list(data.values())
-    # 按提交时间排序
-    all_records.sort(key=lambda x: x.get('submission_time', ''), reverse=True)
+    # 数据未变化时直接返回304
+    etag, last_modified = data_version_etag('admin_dashboard', current_user.id)
+    if is_not_modified(etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    
+    # 获取所有提交记录（未关联用户的记录按姓名计为不同的提交人）
+    all_records = submission_index.all_records()
+    submitters = {record.user_id if record.user_id is not None else ('name', record.name) for record in all_records}
+    # 按提交时间取最近的记录
+    recent_records = heapq.nlargest(5, all_records, key=lambda x: x.submission_time)
     
-    return render_template('admin_dashboard.html', user=current_user, records=all_records)
+    response = make_response(render_template('admin_dashboard.html', user=current_user,
+                                              total_records=len(all_records),
+                                              submitter_count=len(submitters),
+                                              recent_records_html=render_record_fragments('_admin_record.html', recent_records)))
+    return add_cache_headers(response, etag, last_modified)
 
 # 生成汇报
 @app.route('/generate_report', methods=['GET', 'POST'])
@@ -287,62 +1619,51 @@ def generate_report():
         return redirect(url_for('user_dashboard'))
     
     if request.method == 'POST':
+        # 多周汇报
+        if request.form.get('report_mode') == 'range':
+            return generate_range_report()
+        
         data_source = request.form.get('data_source')
         
         if data_source == 'file':
-            # 从文件上传获取数据
-            if 'file' not in request.files:
-                flash('请选择一个文件上传')
-                return redirect(request.url)
-            
-            file = request.files['file']
-            if file.filename == '':
+            # 从文件上传获取数据（支持多个文件）
+            files = [file for file in request.files.getlist('file') if file.filename]
+            if not files:
                 flash('请选择一个文件上传')
                 return redirect(request.url)
             
-            # 保存上传的文件
-            filename = f"{uuid.uuid4()}_{file.filename}"
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            
-            try:
-                # 读取文件
-                if file.filename.endswith(('.xlsx', '.xls')):
-                    df = pd.read_excel(filepath)
-                elif file.filename.endswith('.csv'):
-                    df = pd.read_csv(filepath)
+            # 直接从内存读取文件内容并行解析，单个文件失败不影响其他文件
+            parsed = parse_report_files([(file.filename, file.read()) for file in files])
+            frames = []
+            for filename, file_df, error in parsed:
+                if error:
+                    flash(f'{filename}：{error}', 'error')
                 else:
-                    flash('不支持的文件格式，请上传Excel或CSV文件')
-                    return redirect(url_for('admin_dashboard'))
-            except Exception as e:
-                flash(f'文件读取失败：{str(e)}')
+                    frames.append(file_df)
+            
+            if not frames:
                 return redirect(url_for('admin_dashboard'))
-            finally:
-                # 清理文件
-                if os.path.exists(filepath):
-                    os.remove(filepath)
+            df = pd.concat(frames, ignore_index=True)
         elif data_source == 'database':
-            # 从数据库获取数据
-            data = load_data()
-            if not data:
+            # 从列式快照获取最近一周的数据（只读取需要的列和该周的分区），汇报周期与内容保持一致
+            latest_week = snapshot.latest_week()
+            snapshot_df = snapshot.load(['name', 'start_date', 'end_date', 'core_work', 'completion',
+                                         'problems', 'next_week_plan', 'submission_time'],
+                                        start=latest_week, end=latest_week)
+            if snapshot_df.empty:
                 flash('没有找到提交数据')
                 return redirect(url_for('admin_dashboard'))
             
             # 转换数据，将英文字段名映射到中文
-            mapped_data = []
-            for record in data.values():
-                mapped_record = {
-                    '姓名': record.get('name', ''),
-                    '本周工作周期': f"{record.get('start_date', '')} - {record.get('end_date', '')}",
-                    '本周核心工作内容': record.get('core_work', ''),
-                    '完成情况': record.get('completion', ''),
-                    '遇到的问题': record.get('problems', ''),
-                    '下周工作计划': record.get('next_week_plan', ''),
-                    '提交时间': record.get('submission_time', '')
-                }
-                mapped_data.append(mapped_record)
-            
-            df = pd.DataFrame(mapped_data)
+            df = pd.DataFrame({
+                '姓名': snapshot_df['name'].astype(str),
+                '本周工作周期': snapshot_df['start_date'].astype(str) + ' - ' + snapshot_df['end_date'].astype(str),
+                '本周核心工作内容': snapshot_df['core_work'],
+                '完成情况': snapshot_df['completion'],
+                '遇到的问题': snapshot_df['problems'],
+                '下周工作计划': snapshot_df['next_week_plan'],
+                '提交时间': snapshot_df['submission_time']
+            })
         else:
             flash('请选择数据来源')
             return redirect(request.url)
@@ -355,8 +1676,7 @@ def generate_report():
             df.columns = [col.strip() for col in df.columns]
             
             # 检查必需字段
-            required_columns = ['姓名', '本周工作周期', '本周核心工作内容', '完成情况', '遇到的问题', '下周工作计划']
-            for col in required_columns:
+            for col in REQUIRED_REPORT_COLUMNS:
                 if col not in df.columns:
                     flash(f'数据缺少必需字段：{col}')
                     return redirect(url_for('admin_dashboard'))
@@ -364,7 +1684,9 @@ def generate_report():
             # 解析工作周期
             period = df['本周工作周期'].iloc[0] if len(df) > 0 else ''
             if '-' in period:
-                start_str, end_str = period.split('-')[:2]
+                # 后台数据格式为"YYYY-MM-DD - YYYY-MM-DD"，需按" - "切分
+                separator = ' - ' if ' - ' in period else '-'
+                start_str, end_str = period.split(separator)[:2]
                 try:
                     # 尝试不同的日期格式
                     for fmt in ['%Y-%m-%d', '%Y/%m/%d', '%Y%m%d']:
@@ -380,10 +1702,8 @@ def generate_report():
                     # 格式化为YYYYMMDD-YYYYMMDD
                     period_formatted = f"{start_date.strftime('%Y%m%d')}-{end_date.strftime('%Y%m%d')}"
                     
-                    # 计算第X周（简单计算：以当前日期为准，每周一为一周开始）
-                    today = datetime.now()
-                    weeks_diff = (today - start_date).days // 7 + 1
-                    week_number = weeks_diff
+                    # 计算第X周（以项目起始日期为第1周）
+                    week_number = project_week_number(start_date.toordinal())
                     
                 except ValueError:
                     period_formatted = period
@@ -397,7 +1717,7 @@ def generate_report():
             df = df.drop_duplicates(subset=['姓名'], keep='last')
             
             # 按姓名首字母排序
-            df = df.sort_values(by='姓名')
+            df = df.sort_values(by='姓名').reset_index(drop=True)
             
             # 生成汇报内容
             report_content = f"# 开源鸿蒙系统研发能力提升第{week_number}周工作总结（{period_formatted}）\n\n"
@@ -423,13 +1743,12 @@ def generate_report():
                 plan = row['下周工作计划']
                 report_content += f"（{idx+1}）{name}：{plan}。\n"
             
-            # 保存汇报内容到文件
-            report_filename = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-            report_path = os.path.join('uploads', report_filename)
-            with open(report_path, 'w', encoding='utf-8') as f:
-                f.write(report_content)
+            # 保存汇报内容到文件（相同内容只保存一份）
+            report_filename = store_artifact(report_content.encode('utf-8'), 'md')
+            report_download_name = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
             
-            return render_template('result.html', report_content=report_content, report_filename=report_filename)
+            return render_template('result.html', report_content=report_content, report_filename=report_filename,
+                                   report_download_name=report_download_name)
             
         except Exception as e:
             flash(f'数据处理失败：{str(e)}')
@@ -446,63 +1765,146 @@ def download_report(filename):
         flash('您没有权限下载此文件')
         return redirect(url_for('user_dashboard'))
     
-    return send_file(os.path.join('uploads', filename), as_attachment=True)
+    # name参数为下载时显示的文件名
+    download_name = secure_filename(request.args.get('name', '')) or None
+    try:
+        return send_artifact(filename, download_name=download_name)
+    except NotFound:
+        flash('文件已过期或不存在，请重新生成')
+        return redirect(url_for('admin_dashboard'))
 
 # 提交表单
 @app.route('/submit_form', methods=['POST'])
 @login_required
 def submit_form():
-    form_data = request.form.to_dict()
+    # 只保留白名单字段（忽略csrf_token、submit等）
+    record = WorkSummary.from_dict(request.form)
+    record.submission_time = datetime.now().isoformat()
+    record.user_id = current_user.id
+    
+    # 获取编辑ID
+    edit_id = request.form.get('edit_id')
     
     # 保存到数据文件
-    data = load_data()
+    with data_lock:
+        if edit_id:
+            # 修改现有记录（仅限当前用户的本周记录）
+            existing = submission_index.get(edit_id)
+            if existing and existing.name == current_user.name and existing.is_current_week:
+                # 更新记录
+                record.id = edit_id
+                save_data(removed=[edit_id], added=[record])
+                return jsonify({'status': 'success', 'message': '修改成功！'})
+        
+        # 生成唯一ID
+        entry_id = str(uuid.uuid4())
+        record.id = entry_id
+        
+        # 更新或添加记录（按用户和周期）
+        existing_keys = submission_index.period_record_ids(current_user.name, record.period_key)
+        save_data(removed=existing_keys, added=[record])
     
-    # 获取编辑ID
-    edit_id = form_data.pop('edit_id', None)
+    return jsonify({'status': 'success', 'message': '提交成功！'})
+
+# 批量提交周报（JSON数组，管理员功能）
+@app.route('/api/summaries/batch', methods=['POST'])
+@login_required
+def submit_batch():
+    if current_user.role != 'admin':
+        return jsonify({'status': 'error', 'message': '您没有权限使用此功能'}), 403
     
-    if edit_id:
-        # 修改现有记录
-        if edit_id in data:
-            # 检查是否是当前用户的记录
-            if data[edit_id].get('name') == current_user.name:
-                # 检查是否为本周
-                today = datetime.now()
-                monday = today - timedelta(days=today.weekday())
-                friday = monday + timedelta(days=4)
-                
-                try:
-                    start_date = datetime.strptime(data[edit_id].get('start_date'), '%Y-%m-%d').date()
-                    end_date = datetime.strptime(data[edit_id].get('end_date'), '%Y-%m-%d').date()
-                    if start_date == monday.date() and end_date == friday.date():
-                        # 更新记录
-                        form_data['id'] = edit_id
-                        form_data['submission_time'] = datetime.now().isoformat()
-                        form_data['user_id'] = current_user.id
-                        data[edit_id] = form_data
-                        save_data(data)
-                        return jsonify({'status': 'success', 'message': '修改成功！'})
-                except:
-                    pass
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        return jsonify({'status': 'error', 'message': '请求体必须是周报JSON数组'}), 400
     
-    # 生成唯一ID
-    entry_id = str(uuid.uuid4())
-    form_data['id'] = entry_id
-    form_data['submission_time'] = datetime.now().isoformat()
-    form_data['user_id'] = current_user.id
+    with data_lock:
+        user_ids = {user_data['name']: user_id for user_id, user_data in load_users().items()}
+        
+        # 本批次涉及的用户和周期 -> 记录ID（与表单提交一致，删除同一用户同一周期的所有已有记录）
+        # 首次遇到某用户某周期时从提交统计索引中取已保存的记录
+        period_index = {}
+        
+        results = []
+        removed, added = [], {}
+        added_results = {}  # 本批次新增的记录ID -> 在results中的位置
+        replaced_results = {}  # 本批次新增的记录ID -> 被它替换的条目在results中的位置
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results.append({'index': index, 'status': 'error', 'errors': {'item': ['周报必须是JSON对象']}})
+                continue
+            
+            # 使用与表单提交相同的校验规则
+            formdata = MultiDict({k: str(v) for k, v in item.items() if v is not None})
+            form = WorkSummaryForm(formdata=formdata, meta={'csrf': False})
+            if not form.validate():
+                results.append({'index': index, 'status': 'error', 'errors': form.errors})
+                continue
+            
+            record = WorkSummary.from_dict(form.data)
+            record.id = str(uuid.uuid4())
+            record.submission_time = datetime.now().isoformat()
+            # 姓名不在用户列表中时不关联用户（不能记到调用接口的管理员名下）
+            record.user_id = user_ids.get(record.name)
+            
+            # 同一用户同一周期以最后一次为准
+            period = (record.name, record.period_key)
+            if period not in period_index:
+                period_index[period] = submission_index.period_record_ids(*period)
+            for existing_key in period_index[period]:
+                # 本批次内已添加的记录直接撤销（其结果标记为被最终保存的记录替换），否则记为删除
+                if added.pop(existing_key, None) is None:
+                    removed.append(existing_key)
+                else:
+                    positions = replaced_results.pop(existing_key, []) + [added_results.pop(existing_key)]
+                    for position in positions:
+                        results[position] = {'index': results[position]['index'], 'status': 'replaced',
+                                             'replaced_by': record.id}
+                    replaced_results[record.id] = positions
+            period_index[period] = [record.id]
+            added[record.id] = record
+            added_results[record.id] = len(results)
+            
+            results.append({'index': index, 'status': 'success', 'id': record.id})
+        
+        succeeded = len(added)
+        if succeeded:
+            save_data(removed=removed, added=added.values())
     
-    # 更新或添加记录（按用户和周期）
-    period_key = f"{form_data.get('start_date')}_{form_data.get('end_date')}"
-    existing_keys = [k for k, v in data.items() 
-                    if v.get('name') == current_user.name 
-                    and f"{v.get('start_date')}_{v.get('end_date')}" == period_key]
+    return jsonify({
+        'status': 'success',
+        'succeeded': succeeded,
+        'replaced': sum(1 for result in results if result['status'] == 'replaced'),
+        'failed': sum(1 for result in results if result['status'] == 'error'),
+        'results': results
+    })
+
+# 全文检索周报（管理员功能）
+@app.route('/api/summaries/search')
+@login_required
+def search_summaries():
+    if current_user.role != 'admin':
+        return jsonify({'status': 'error', 'message': '您没有权限使用此功能'}), 403
     
-    for key in existing_keys:
-        del data[key]
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'status': 'error', 'message': '检索内容不能为空'}), 400
     
-    data[entry_id] = form_data
-    save_data(data)
+    try:
+        start = encode_date(request.args.get('start_date'))
+        end = encode_date(request.args.get('end_date'))
+        if isinstance(start, str) or isinstance(end, str):
+            raise ValueError
+        limit = min(int(request.args.get('limit', 20)), 200)
+    except ValueError:
+        return jsonify({'status': 'error', 'message': '参数格式错误，日期格式为YYYY-MM-DD'}), 400
     
-    return jsonify({'status': 'success', 'message': '提交成功！'})
+    results = search_index.search(query, name=request.args.get('name') or None,
+                                  start=start, end=end, limit=limit)
+    
+    return jsonify({
+        'status': 'success',
+        'results': [dict(record.to_dict(), score=round(score, 4)) for score, record in results]
+    })
 
 # 生成表单页面
 @app.route('/form')
@@ -523,28 +1925,22 @@ def form_page():
     
     # 如果是编辑模式，加载现有数据
     if edit_id:
-        data = load_data()
-        if edit_id in data:
-            record = data[edit_id]
-            # 检查是否是当前用户的记录
-            if record.get('name') == current_user.name:
-                # 检查是否为本周
-                try:
-                    start_date = datetime.strptime(record.get('start_date'), '%Y-%m-%d').date()
-                    end_date = datetime.strptime(record.get('end_date'), '%Y-%m-%d').date()
-                    if start_date == monday.date() and end_date == friday.date():
-                        # 加载现有数据
-                        form.department.data = record.get('department', '')
-                        form.core_work.data = record.get('core_work', '')
-                        form.completion.data = record.get('completion', '')
-                        form.problems.data = record.get('problems', '')
-                        form.next_week_plan.data = record.get('next_week_plan', '')
-                        return render_template('form.html', form=form, edit_id=edit_id)
-                except:
-                    pass
+        record = submission_index.get(edit_id)
+        # 检查是否是当前用户的本周记录
+        if record and record.name == current_user.name and record.is_current_week:
+            # 加载现有数据
+            form.department.data = record.department
+            form.core_work.data = record.core_work
+            form.completion.data = record.completion
+            form.problems.data = record.problems
+            form.next_week_plan.data = record.next_week_plan
+            return render_template('form.html', form=form, edit_id=edit_id)
     
     return render_template('form.html', form=form)
 
+# 各格式最近一次导出的数据版本（版本号和数据文件状态）和文件名
+export_cache = {}
+
 # 导出数据为Excel
 @app.route('/export_excel')
 @login_required
@@ -553,20 +1949,30 @@ def export_excel():
         flash('您没有权限导出数据')
         return redirect(url_for('user_dashboard'))
     
-    data = load_data()
-    if not data:
-        flash('没有数据可以导出')
-        return redirect(url_for('admin_dashboard'))
-    
-    # 转换为DataFrame
-    df = pd.DataFrame(list(data.values()))
+    # 数据未变化时直接返回304
+    etag, last_modified = data_version_etag('export_xlsx')
+    if is_not_modified(etag, last_modified):
+        return not_modified_response(etag, last_modified)
     
-    # 保存为Excel文件
-    export_filename = f"work_summaries_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    export_path = os.path.join('uploads', export_filename)
-    df.to_excel(export_path, index=False)
+    # 同一数据版本的导出文件直接复用
+    version = load_data_version()
+    version = (version['version'], version['stamp'])
+    cached_version, export_filename = export_cache.get('xlsx', (None, None))
+    if cached_version != version or not os.path.exists(os.path.join(app.config['UPLOAD_FOLDER'], export_filename)):
+        # 从列式快照读取数据
+        df = snapshot.load()
+        if df.empty:
+            flash('没有数据可以导出')
+            return redirect(url_for('admin_dashboard'))
+        
+        # 保存为Excel文件（Excel文件内含生成时间，按表格数据计算哈希）
+        export_filename = store_artifact(df.to_csv(index=False).encode('utf-8'), 'xlsx',
+                                         lambda path: df.to_excel(path, index=False))
+        export_cache['xlsx'] = (version, export_filename)
     
-    return send_file(export_path, as_attachment=True)
+    response = send_artifact(export_filename, conditional=False,
+                             download_name=f"work_summaries_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
+    return add_cache_headers(response, etag, last_modified)
 
 # 导出数据为CSV
 @app.route('/export_csv')
@@ -576,20 +1982,29 @@ def export_csv():
         flash('您没有权限导出数据')
         return redirect(url_for('user_dashboard'))
     
-    data = load_data()
-    if not data:
-        flash('没有数据可以导出')
-        return redirect(url_for('admin_dashboard'))
-    
-    # 转换为DataFrame
-    df = pd.DataFrame(list(data.values()))
+    # 数据未变化时直接返回304
+    etag, last_modified = data_version_etag('export_csv')
+    if is_not_modified(etag, last_modified):
+        return not_modified_response(etag, last_modified)
     
-    # 保存为CSV文件
-    export_filename = f"work_summaries_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    export_path = os.path.join('uploads', export_filename)
-    df.to_csv(export_path, index=False, encoding='utf-8-sig')
+    # 同一数据版本的导出文件直接复用
+    version = load_data_version()
+    version = (version['version'], version['stamp'])
+    cached_version, export_filename = export_cache.get('csv', (None, None))
+    if cached_version != version or not os.path.exists(os.path.join(app.config['UPLOAD_FOLDER'], export_filename)):
+        # 从列式快照读取数据
+        df = snapshot.load()
+        if df.empty:
+            flash('没有数据可以导出')
+            return redirect(url_for('admin_dashboard'))
+        
+        # 保存为CSV文件
+        export_filename = store_artifact(df.to_csv(index=False).encode('utf-8-sig'), 'csv')
+        export_cache['csv'] = (version, export_filename)
     
-    return send_file(export_path, as_attachment=True)
+    response = send_artifact(export_filename, conditional=False,
+                             download_name=f"work_summaries_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    return add_cache_headers(response, etag, last_modified)
 
 # 生成新表单（管理员功能）
 @app.route('/create_form')
@@ -609,37 +2024,79 @@ def submission_stats():
         flash('您没有权限使用此功能')
         return redirect(url_for('user_dashboard'))
     
-    # 获取所有用户和提交记录
-    users = load_users()
-    data = load_data()
-    
     # 获取当前周期（本周）
-    today = datetime.now()
-    monday = today - timedelta(days=today.weekday())
-    friday = monday + timedelta(days=4)
-    current_period_start = monday.strftime('%Y-%m-%d')
-    current_period_end = friday.strftime('%Y-%m-%d')
-    current_period_key = f"{current_period_start}_{current_period_end}"
+    current_period_key = current_week_ordinals()
+    current_period_start = decode_date(current_period_key[0])
+    current_period_end = decode_date(current_period_key[1])
     
-    # 统计已提交和未提交的用户
-    submitted_users = set()
-    submission_times = {}
+    # 数据和统计周期均未变化时直接返回304
+    etag, last_modified = data_version_etag('submission_stats', current_period_key[0])
+    if is_not_modified(etag, last_modified):
+        return not_modified_response(etag, last_modified)
     
-    for record in data.values():
-        record_period_key = f"{record.get('start_date', '')}_{record.get('end_date', '')}"
-        if record_period_key == current_period_key:
-            submitted_users.add(record.get('name', ''))
-            submission_times[record.get('name', '')] = record.get('submission_time', '')
+    # 统计已提交和未提交的用户
+    users = load_users()
+    submitters = submission_index.submitters(current_period_key)
+    submitted_users = set(submitters)
+    submission_times = {name: record.submission_time for name, record in submitters.items()}
     
     all_users = {user_data['name'] for user_data in users.values() if user_data['role'] == 'user'}
     not_submitted_users = all_users - submitted_users
     
-    return render_template('submission_stats.html', 
+    response = make_response(render_template('submission_stats.html', 
                           current_period_start=current_period_start,
                           current_period_end=current_period_end,
                           submitted_users=submitted_users,
                           not_submitted_users=not_submitted_users,
-                          submission_times=submission_times)
+                          submission_times=submission_times))
+    return add_cache_headers(response, etag, last_modified)
+
+# 查看慢请求性能分析（管理员功能）
+@app.route('/profiles')
+@login_required
+def profiles():
+    if current_user.role != 'admin':
+        flash('您没有权限使用此功能')
+        return redirect(url_for('user_dashboard'))
+
+    with profile_lock:
+        slowest = sorted(recent_profiles, key=lambda x: x['elapsed_ms'], reverse=True)
+
+    enabled = app.config['PROFILE_SAMPLE_RATE'] > 0 or app.config['PROFILE_SLOW_MS'] > 0
+    return render_template('profiles.html',
+                          profiles=slowest,
+                          enabled=enabled,
+                          sample_rate=app.config['PROFILE_SAMPLE_RATE'],
+                          slow_ms=app.config['PROFILE_SLOW_MS'],
+                          profile_dir=app.config['PROFILE_DIR'])
+
+# 多周提交统计（管理员功能）
+@app.route('/api/submission_stats')
+@login_required
+def submission_stats_range():
+    if current_user.role != 'admin':
+        return jsonify({'status': 'error', 'message': '您没有权限使用此功能'}), 403
+    
+    # 默认统计本周
+    current_start, current_end = current_week_ordinals()
+    start = encode_date(request.args.get('start_date')) or current_start
+    end = encode_date(request.args.get('end_date')) or current_end
+    if isinstance(start, str) or isinstance(end, str) or start > end:
+        return jsonify({'status': 'error', 'message': '参数格式错误，日期格式为YYYY-MM-DD'}), 400
+    
+    # 限制统计周数；最后一周的截止日（周五次日零点）也必须是有效日期
+    first_monday = start - date.fromordinal(start).weekday()
+    last_monday = end - date.fromordinal(end).weekday()
+    weeks = (last_monday - first_monday) // 7 + 1
+    if weeks > app.config['STATS_MAX_WEEKS']:
+        return jsonify({'status': 'error', 'message': f"统计范围过大，最多{app.config['STATS_MAX_WEEKS']}周"}), 400
+    if last_monday + 5 > date.max.toordinal():
+        return jsonify({'status': 'error', 'message': '结束日期超出可统计范围'}), 400
+    
+    names = sorted({user_data['name'] for user_data in load_users().values() if user_data['role'] == 'user'})
+    report = submission_index.report(names, start, end)
+    
+    return jsonify(dict(report, status='success'))
 
 # 初始化OpenAI客户端（对接火山引擎方舟）
 def init_openai_client(api_key):
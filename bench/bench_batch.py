@@ -0,0 +1,35 @@
+# 批量提交接口 vs 逐条表单提交
+# 用法：python bench/bench_batch.py [提交条数，默认500] [已有记录数，默认5000]
+import sys
+
+from common import ADMIN_PHONE, load_app, make_summaries, write_summaries, login, timed
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    existing = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    app = load_app()
+    summaries = make_summaries(existing, [f'用户{i}' for i in range(50)])
+    items = [{
+        'name': f'新用户{i}',
+        'department': '技术研发部',
+        'start_date': '2026-10-19',
+        'end_date': '2026-10-23',
+        'core_work': '完成ArkUI适配',
+        'completion': '完成',
+        'next_week_plan': '继续'
+    } for i in range(count)]
+    client = login(app, ADMIN_PHONE)
+
+    write_summaries(app, summaries)
+    _, sequential_seconds = timed(lambda: [client.post('/submit_form', data=item) for item in items])
+
+    write_summaries(app, summaries)
+    response, batch_seconds = timed(client.post, '/api/summaries/batch', json=items)
+    assert response.json['succeeded'] == count
+
+    print(f'{count}条周报（已有{existing}条）：'
+          f'逐条submit_form {sequential_seconds:.2f}s（{count / sequential_seconds:.0f}条/s），'
+          f'批量接口 {batch_seconds:.3f}s（{count / batch_seconds:.0f}条/s）')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+# 响应压缩：传输大小和估算的完整接收时间（TTLB）
+# 用法：python bench/bench_compression.py [记录数，默认50000] [带宽Mbit/s，默认20]
+import sys
+
+from common import ADMIN_PHONE, USER_PHONE, USER_NAME, load_app, make_summaries, write_summaries, login, timed
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    mbit = float(sys.argv[2]) if len(sys.argv) > 2 else 20
+    app = load_app()
+    # 普通用户有3000条历史记录，其余为其他用户
+    names = [USER_NAME] * 6 + [f'用户{i}' for i in range(94)]
+    write_summaries(app, make_summaries(count, names, weeks=300))
+
+    for phone, url in [(USER_PHONE, '/user_dashboard'), (ADMIN_PHONE, '/export_csv')]:
+        client = login(app, phone)
+        client.get(url)  # 预热索引和缓存
+        for encoding in ['identity', 'gzip', 'gzip']:
+            response, seconds = timed(client.get, url, headers={'Accept-Encoding': encoding})
+            size = len(response.data)
+            ttlb = seconds * 1000 + size * 8 / mbit / 1000
+            print(f'{url:16} {encoding:8} {size / 1024:8.0f}KiB  服务端 {seconds * 1000:6.0f}ms  '
+                  f'估算TTLB@{mbit:g}Mbit/s {ttlb:6.0f}ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+# 仪表盘渲染：记录片段缓存开启 vs 关闭
+# 用法：python bench/bench_dashboard.py [该用户的记录数，默认50000]
+import sys
+from datetime import date
+
+from common import ADMIN_PHONE, USER_PHONE, USER_NAME, load_app, make_summaries, write_summaries, login, timed
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    app = load_app()
+    # 记录分布在最近10年的各周，最后一周为本周
+    weeks = 520
+    monday = date.fromordinal(app.current_week_ordinals()[0])
+    summaries = make_summaries(count, [USER_NAME], first_monday=date.fromordinal(monday.toordinal() - 7 * (weeks - 1)),
+                               weeks=weeks)
+    write_summaries(app, summaries)
+    cache_size = app.app.config['FRAGMENT_CACHE_SIZE']
+
+    for phone, url in [(USER_PHONE, '/user_dashboard'), (ADMIN_PHONE, '/admin_dashboard')]:
+        client = login(app, phone)
+        app.fragment_cache.clear()
+        _, cold_seconds = timed(client.get, url)
+        warm = [timed(client.get, url)[1] for _ in range(3)]
+
+        # 缓存大小为0时每次都重新渲染所有片段
+        app.app.config['FRAGMENT_CACHE_SIZE'] = 0
+        app.fragment_cache.clear()
+        uncached = [timed(client.get, url)[1] for _ in range(3)]
+        app.app.config['FRAGMENT_CACHE_SIZE'] = cache_size
+
+        print(f'{url}（{count}条记录）：首次 {cold_seconds * 1000:.0f}ms，'
+              f'缓存命中 {min(warm) * 1000:.0f}ms，无缓存 {min(uncached) * 1000:.0f}ms')
+
+if __name__ == '__main__':
+    main()
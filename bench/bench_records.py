@@ -0,0 +1,61 @@
+# 周报记录内存占用、加载耗时和本周判断耗时：原始字典 vs WorkSummary
+# 用法：python bench/bench_records.py [记录数，默认100000]
+import sys
+import json
+import tracemalloc
+from datetime import datetime
+
+from common import load_app, make_summaries, write_summaries, timed
+
+# 统计构造对象占用的内存（字节）
+def traced(func):
+    tracemalloc.start()
+    result = func()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    app = load_app()
+    names = [f'用户{i}' for i in range(500)]
+    summaries = make_summaries(count, names)
+    # 模拟旧版本表单直接保存的多余字段
+    for summary in summaries.values():
+        summary['csrf_token'] = 'x' * 40
+        summary['submit'] = '提交'
+    text = json.dumps(summaries, ensure_ascii=False)
+
+    dicts, dict_bytes = traced(lambda: json.loads(text))
+    records, record_bytes = traced(lambda: {key: app.WorkSummary.from_dict(value)
+                                            for key, value in json.loads(text).items()})
+    print(f'{count}条记录，每条内存：dict {dict_bytes / count:.0f}字节，WorkSummary {record_bytes / count:.0f}字节')
+
+    # 旧版本load_data直接返回JSON解析出的字典
+    def load_dicts():
+        with open(app.DATA_FILE, 'r') as f:
+            return json.load(f)
+
+    write_summaries(app, summaries)
+    _, dicts_seconds = timed(load_dicts)
+    _, load_seconds = timed(app.load_data)
+    print(f'加载数据文件：dict {dicts_seconds * 1000:.0f}ms，WorkSummary {load_seconds * 1000:.0f}ms')
+
+    # 旧版本每次判断本周都要用strptime解析日期字符串
+    def strptime_check():
+        today = datetime.now().date()
+        for value in dicts.values():
+            start = datetime.strptime(value['start_date'], '%Y-%m-%d').date()
+            end = datetime.strptime(value['end_date'], '%Y-%m-%d').date()
+            start <= today <= end
+
+    def ordinal_check():
+        for record in records.values():
+            record.is_current_week
+
+    _, strptime_seconds = timed(strptime_check)
+    _, ordinal_seconds = timed(ordinal_check)
+    print(f'遍历判断本周记录：strptime {strptime_seconds * 1000:.0f}ms，日期序数 {ordinal_seconds * 1000:.0f}ms')
+
+if __name__ == '__main__':
+    main()
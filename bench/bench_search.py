@@ -0,0 +1,47 @@
+# 全文检索查询耗时：常见词、单字、多词和带过滤条件的查询
+# 用法：python bench/bench_search.py [记录数，默认200000]
+import sys
+import statistics
+
+from common import load_app, make_summaries, write_summaries, timed
+
+QUERIES = [
+    ('ArkUI bug', {}),
+    ('鸿蒙', {}),
+    ('鸿', {}),
+    ('性能优化', {}),
+    ('鸿蒙 测试环境', {}),
+    ('联调', {'name': '用户7'}),
+    ('鸿蒙', {'weeks': 'latest'}),
+    ('鸿蒙', {'weeks': 'oldest'}),
+    ('arkui', {'weeks': 'oldest'}),
+    ('联调', {'weeks': 'oldest'}),
+]
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    app = load_app()
+    # 部分周报多次提到同一个词，使各记录的词频不完全相同
+    text = lambda i: f'完成鸿蒙ArkUI组件适配与分布式软总线联调{i}' + '，鸿蒙性能优化' * (i % 97 == 0)
+    write_summaries(app, make_summaries(count, [f'用户{i}' for i in range(2000)], weeks=104, text=text))
+    index = app.search_index
+
+    _, build_seconds = timed(index.ensure_current)
+    print(f'{count}条记录：索引全量构建 {build_seconds:.2f}s')
+
+    # 最近13周和最早13周（较早的周期需要跳过大量较新的记录）
+    mondays = sorted(week for week in index.by_week if week is not None)
+    quarters = {'latest': (mondays[-13], mondays[-1] + 4), 'oldest': (mondays[0], mondays[12] + 4)}
+    for query, kwargs in QUERIES:
+        if 'weeks' in kwargs:
+            start, end = quarters[kwargs['weeks']]
+            kwargs = {'start': start, 'end': end}
+        times = []
+        for _ in range(5):
+            results, seconds = timed(index.search, query, **kwargs)
+            times.append(seconds)
+        label = ' '.join([query] + [f'{key}={value}' for key, value in kwargs.items()])
+        print(f'{label:<36} {len(results):>3}条结果  中位数 {statistics.median(times) * 1000:.1f}ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# 列式快照读取 vs 加载JSON后构造DataFrame
+# 用法：python bench/bench_snapshot.py [记录数，默认1000000]
+import os
+import sys
+import tracemalloc
+
+import pandas as pd
+import pyarrow as pa
+
+from common import load_app, make_summaries, write_summaries, timed
+
+REPORT_COLUMNS = ['name', 'start_date', 'end_date', 'core_work', 'completion',
+                  'problems', 'next_week_plan', 'submission_time']
+
+# 统计耗时（秒）和内存（MiB）：Python堆峰值加上结果占用的Arrow内存（tracemalloc统计不到Arrow分配的内存）
+def measure(func):
+    arrow_before = pa.total_allocated_bytes()
+    tracemalloc.start()
+    result, seconds = timed(func)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, (peak + pa.total_allocated_bytes() - arrow_before) / 1024 / 1024
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    app = load_app()
+    write_summaries(app, make_summaries(count, [f'用户{i}' for i in range(2000)], weeks=104))
+    snapshot = app.snapshot
+
+    # 首次使用或清单过期时全量构建快照
+    data = app.load_data()
+    _, rebuild_seconds = timed(snapshot.rebuild, data, app.load_data_version()['version'])
+    snapshot_dir = app.app.config['SNAPSHOT_DIR']
+    disk_bytes = sum(os.path.getsize(os.path.join(snapshot_dir, f)) for f in os.listdir(snapshot_dir))
+    print(f'{count}条记录：快照全量构建 {rebuild_seconds:.2f}s，磁盘占用 {disk_bytes / 1024 / 1024:.0f}MiB')
+    del data
+
+    # 进程重启或其他进程写入后从清单恢复，无需重建
+    snapshot.version = None
+    _, manifest_seconds = timed(snapshot.ensure_current)
+    print(f'从清单恢复快照：{manifest_seconds:.2f}s')
+
+    def json_frame():
+        return pd.DataFrame([record.to_dict() for record in app.load_data().values()])
+
+    weeks = sorted(int(partition) for partition in snapshot._partitions() if partition != 'other')
+    cases = [
+        ('加载JSON并构造DataFrame', json_frame),
+        ('快照，全部列', lambda: snapshot.load()),
+        ('快照，汇报所需列', lambda: snapshot.load(REPORT_COLUMNS)),
+        ('快照，13周范围', lambda: snapshot.load(REPORT_COLUMNS, weeks[-13], weeks[-1])),
+        ('快照，最近一周', lambda: snapshot.load(REPORT_COLUMNS, weeks[-1], weeks[-1])),
+    ]
+    for label, func in cases:
+        df, seconds, peak = measure(func)
+        print(f'{label}：{seconds * 1000:.0f}ms，内存 {peak:.0f}MiB，{len(df)}行')
+        del df
+
+if __name__ == '__main__':
+    main()
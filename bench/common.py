@@ -0,0 +1,73 @@
+# 基准测试公共工具：在临时目录中运行应用，不影响data/下的真实数据
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 默认管理员和普通用户账号（与data/users.json一致）
+ADMIN_PHONE = '15828647311'
+USER_PHONE = '15680807231'
+USER_NAME = '唐鑫钊'
+
+# 创建临时工作目录（复制用户数据），切换到该目录后导入应用
+def load_app():
+    workdir = tempfile.mkdtemp(prefix='bench_')
+    os.makedirs(os.path.join(workdir, 'data'))
+    os.makedirs(os.path.join(workdir, 'uploads'))
+    shutil.copy(os.path.join(REPO_DIR, 'data', 'users.json'), os.path.join(workdir, 'data', 'users.json'))
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_DIR)
+
+    import app
+    app.app.config['WTF_CSRF_ENABLED'] = False
+    # 下载文件时相对路径按应用根目录解析，临时目录需使用绝对路径
+    app.app.config['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+    # 只在基准测试结束时清理临时目录
+    import atexit
+    atexit.register(shutil.rmtree, workdir, True)
+    return app
+
+# 生成合成周报数据（JSON格式的字典），每人每周一条
+def make_summaries(count, names, first_monday=date(2024, 1, 1), weeks=100, text=None):
+    summaries = {}
+    for i in range(count):
+        monday = first_monday + timedelta(weeks=i % weeks)
+        record_id = str(uuid.uuid4())
+        summaries[record_id] = {
+            'name': names[i % len(names)],
+            'department': '技术研发部',
+            'start_date': monday.isoformat(),
+            'end_date': (monday + timedelta(days=4)).isoformat(),
+            'core_work': text(i) if text else f'完成鸿蒙ArkUI组件适配与分布式软总线联调{i}',
+            'completion': '完成度100%',
+            'problems': '测试环境不稳定' if i % 2 else '',
+            'next_week_plan': '继续推进鸿蒙内核模块的性能优化',
+            'id': record_id,
+            'submission_time': f'{monday.isoformat()}T10:00:00.{i % 1000000:06d}',
+            'user_id': '2'
+        }
+    return summaries
+
+# 写入周报数据文件并递增数据版本（使索引和快照失效）
+def write_summaries(app, summaries):
+    with open(app.DATA_FILE, 'w') as f:
+        json.dump(summaries, f, ensure_ascii=False)
+    app.bump_data_version()
+
+# 登录并返回测试客户端
+def login(app, phone):
+    client = app.app.test_client()
+    client.post('/login', data={'phone': phone, 'password': '123456'})
+    return client
+
+# 计时（秒）
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
@@ -0,0 +1,28 @@
+# 汇报文件解析（在解析进程池的子进程中运行）
+# 本模块导入时不能有副作用（创建数据文件、启动线程等），子进程只需导入本模块
+import io
+
+import pandas as pd
+
+# 汇报数据必需字段
+REQUIRED_REPORT_COLUMNS = ['姓名', '本周工作周期', '本周核心工作内容', '完成情况', '遇到的问题', '下周工作计划']
+
+# 解析上传的汇报文件，返回(DataFrame, 错误信息)
+def parse_report_file(filename, content):
+    try:
+        buffer = io.BytesIO(content)
+        if filename.endswith(('.xlsx', '.xls')):
+            df = pd.read_excel(buffer)
+        elif filename.endswith('.csv'):
+            df = pd.read_csv(buffer)
+        else:
+            return None, '不支持的文件格式，请上传Excel或CSV文件'
+    except Exception as e:
+        return None, f'文件读取失败：{str(e)}'
+    
+    df = df.dropna(how='all')  # 忽略空白行
+    df.columns = [str(col).strip() for col in df.columns]
+    missing = [col for col in REQUIRED_REPORT_COLUMNS if col not in df.columns]
+    if missing:
+        return None, f"数据缺少必需字段：{'、'.join(missing)}"
+    return df, None